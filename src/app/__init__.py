@@ -0,0 +1,5 @@
+import time
+
+# Se ejecuta antes que cualquier import de app.main (stdlib, fastapi, módulos de la app):
+# base del tiempo "import" del reporte de arranque en frío (ver startup.py)
+IMPORT_T0 = time.perf_counter()
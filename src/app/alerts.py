@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import secrets
+import socket
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("uvicorn.error")
+
+RULE_KINDS = ("above", "below", "pct")
+DEFAULT_MAX_RULES = 1000
+
+
+@dataclass
+class Rule:
+    id: str
+    pair: str  # "USD/MXN" = cuántos MXN por 1 USD
+    kind: str  # above | below | pct
+    value: float  # nivel (above/below) o % de cambio absoluto entre snapshots (pct)
+    webhook: Optional[str] = None
+
+    def public(self) -> Dict[str, Any]:
+        """Vista para listados y alertas: el webhook suele llevar un token (Slack, Teams), se enmascara."""
+        return {**asdict(self), "webhook": mask_webhook(self.webhook) if self.webhook else None}
+
+
+@dataclass
+class _SortedRules:
+    values: List[float] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+
+    def add(self, value: float, rule_id: str) -> None:
+        i = bisect_right(self.values, value)
+        self.values.insert(i, value)
+        self.ids.insert(i, rule_id)
+
+    def remove(self, rule_id: str) -> None:
+        i = self.ids.index(rule_id)
+        del self.values[i]
+        del self.ids[i]
+
+
+def parse_pair(pair: str) -> Tuple[str, str]:
+    base, sep, quote = pair.upper().replace(" ", "").partition("/")
+    if not sep or len(base) != 3 or len(quote) != 3 or base == quote:
+        raise ValueError(f"Invalid pair: {pair!r} (expected e.g. USD/MXN)")
+    return base, quote
+
+
+def _is_public_ip(host: str) -> Optional[bool]:
+    """True/False si host es una IP literal (pública o no); None si es un nombre."""
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_global
+    except ValueError:
+        return None
+
+
+def validate_webhook(url: str, allowlist: Iterable[str] = ()) -> str:
+    """Sólo https y hosts públicos (o, si hay allowlist, sólo esos hosts): evita SSRF hacia la red interna."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if parts.scheme != "https" or not host:
+        raise ValueError("webhook must be an https:// URL")
+
+    allowed = {h.lower() for h in allowlist}
+    if allowed:
+        if host not in allowed:
+            raise ValueError(f"webhook host not allowed: {host}")
+        return parts.geturl()
+
+    if host == "localhost" or host.endswith((".localhost", ".internal", ".local")) or _is_public_ip(host) is False:
+        raise ValueError(f"webhook host not allowed: {host}")
+    return parts.geturl()
+
+
+def mask_webhook(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.hostname}/***"
+
+
+async def resolves_to_public(host: str) -> bool:
+    # Se re-chequea al entregar: un nombre público puede resolver a una IP interna
+    public = _is_public_ip(host)
+    if public is not None:
+        return public
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+    except OSError:
+        return False
+    return bool(infos) and all(_is_public_ip(info[4][0]) for info in infos)
+
+
+class WatcherRegistry:
+    """Reglas de alerta indexadas por símbolo y ordenadas por nivel.
+
+    evaluate() sólo mira los pares cuyo símbolo cambió respecto del snapshot anterior y,
+    por par, resuelve qué reglas dispararon con bisect sobre los niveles ordenados:
+    el costo depende de los símbolos cambiados y de las reglas que disparan, no del total.
+    """
+
+    def __init__(self, base: str, max_rules: int = DEFAULT_MAX_RULES, webhook_allowlist: Iterable[str] = ()) -> None:
+        self.base = base
+        self.max_rules = max_rules
+        self.webhook_allowlist = tuple(webhook_allowlist)
+        self._rules: Dict[str, Rule] = {}
+        self._books: Dict[str, Dict[str, _SortedRules]] = {}  # pair -> kind -> reglas
+        self._pairs_by_symbol: Dict[str, Set[str]] = {}
+        self._last: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def rules(self) -> List[Rule]:
+        return list(self._rules.values())
+
+    def webhook(self, rule_id: str) -> Optional[str]:
+        rule = self._rules.get(rule_id)
+        return rule.webhook if rule is not None else None
+
+    def add(self, pair: str, kind: str, value: float, webhook: Optional[str] = None) -> Rule:
+        base, quote = parse_pair(pair)
+        kind = kind.lower().strip()
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Invalid kind: {kind!r} (expected one of {', '.join(RULE_KINDS)})")
+        if value <= 0:
+            raise ValueError("value must be > 0")
+        if webhook:
+            webhook = validate_webhook(webhook, self.webhook_allowlist)
+        if len(self._rules) >= self.max_rules:
+            raise ValueError(f"Too many alert rules (max {self.max_rules})")
+
+        # Id no adivinable: es lo único que hace falta para borrar la regla
+        rule = Rule(id=secrets.token_urlsafe(12), pair=f"{base}/{quote}", kind=kind, value=float(value), webhook=webhook)
+        self._rules[rule.id] = rule
+
+        book = self._books.setdefault(rule.pair, {k: _SortedRules() for k in RULE_KINDS})
+        book[kind].add(rule.value, rule.id)
+        for sym in (base, quote):
+            self._pairs_by_symbol.setdefault(sym, set()).add(rule.pair)
+        return rule
+
+    def remove(self, rule_id: str) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+
+        book = self._books[rule.pair]
+        book[rule.kind].remove(rule.id)
+        if not any(sr.ids for sr in book.values()):
+            del self._books[rule.pair]
+            for sym in parse_pair(rule.pair):
+                pairs = self._pairs_by_symbol.get(sym, set())
+                pairs.discard(rule.pair)
+                if not pairs:
+                    self._pairs_by_symbol.pop(sym, None)
+        return True
+
+    def _pair_rate(self, rates: Dict[str, float], pair: str) -> Optional[float]:
+        base, quote = parse_pair(pair)
+        r_base = rates.get(base)
+        r_quote = rates.get(quote)
+        if not r_base or not r_quote:
+            return None
+        return r_quote / r_base
+
+    def evaluate(self, rates: Dict[str, Any], fx_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Evalúa un snapshot nuevo (rates BASE -> X) y devuelve las alertas disparadas."""
+        current: Dict[str, float] = {self.base: 1.0}
+        for k, v in rates.items():
+            try:
+                current[k] = float(v)
+            except (TypeError, ValueError):
+                continue
+
+        previous, self._last = self._last, current
+        if not previous or not self._rules:
+            return []
+
+        changed = {s for s, r in current.items() if previous.get(s) != r}
+        pairs: Set[str] = set()
+        for sym in changed:
+            pairs |= self._pairs_by_symbol.get(sym, set())
+
+        alerts: List[Dict[str, Any]] = []
+        for pair in sorted(pairs):
+            prev = self._pair_rate(previous, pair)
+            now = self._pair_rate(current, pair)
+            if prev is None or now is None or prev == now:
+                continue
+
+            book = self._books[pair]
+            change_pct = (now - prev) / prev * 100
+
+            fired: List[str] = []
+            above = book["above"]
+            fired += above.ids[bisect_right(above.values, prev):bisect_right(above.values, now)]
+            below = book["below"]
+            fired += below.ids[bisect_left(below.values, now):bisect_left(below.values, prev)]
+            pct = book["pct"]
+            fired += pct.ids[:bisect_right(pct.values, abs(change_pct))]
+
+            for rule_id in fired:
+                alerts.append(
+                    {
+                        **self._rules[rule_id].public(),
+                        "previous": prev,
+                        "rate": now,
+                        "change_pct": round(change_pct, 6),
+                        "fx_date": fx_date,
+                    }
+                )
+        return alerts
+
+
+class AlertSink(ABC):
+    @abstractmethod
+    def deliver(self, alerts: List[Dict[str, Any]]) -> None:
+        ...
+
+
+class WebhookSink(AlertSink):
+    """POST {"alerts": [...]} al webhook de cada regla, en background.
+
+    Las alertas sólo traen el webhook enmascarado: la URL real se busca en el registry.
+    """
+
+    def __init__(self, registry: WatcherRegistry, timeout: float = 10.0, allowlist: Iterable[str] = ()) -> None:
+        self.registry = registry
+        self.timeout = timeout
+        self.allowlist = {h.lower() for h in allowlist}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def deliver(self, alerts: List[Dict[str, Any]]) -> None:
+        by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for a in alerts:
+            url = self.registry.webhook(a["id"])
+            if url:
+                by_url.setdefault(url, []).append(a)
+
+        for url, batch in by_url.items():
+            task = asyncio.get_running_loop().create_task(self._post(url, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _post(self, url: str, batch: List[Dict[str, Any]]) -> None:
+        import httpx
+
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self.allowlist and not await resolves_to_public(host):
+            logger.warning("alert webhook %s skipped: host does not resolve to a public address", mask_webhook(url))
+            return
+
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                r = await client.post(url, json={"alerts": batch})
+                r.raise_for_status()
+        except Exception as ex:
+            logger.warning("alert webhook %s failed: %s", mask_webhook(url), type(ex).__name__)
+
+
+class StreamSink(AlertSink):
+    """Reparte las alertas a los suscriptores del stream (SSE)."""
+
+    def __init__(self, maxsize: int = 100) -> None:
+        self.maxsize = maxsize
+        self._subscribers: Set["asyncio.Queue[Dict[str, Any]]"] = set()
+
+    def subscribe(self) -> "asyncio.Queue[Dict[str, Any]]":
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=self.maxsize)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+        self._subscribers.discard(queue)
+
+    def deliver(self, alerts: List[Dict[str, Any]]) -> None:
+        for queue in self._subscribers:
+            for a in alerts:
+                try:
+                    queue.put_nowait(a)
+                except asyncio.QueueFull:
+                    # Cliente lento: se descarta en lugar de bloquear el refresh
+                    break
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Assets con URL fingerprint (nombre.<hash>.ext) servidos desde memoria
+FINGERPRINTED_ASSETS = ("app.js", "styles.css")
+ASSETS_PREFIX = "/assets"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_HASH_LEN = 12
+
+
+@dataclass
+class Asset:
+    name: str
+    hashed_name: str
+    media_type: str
+    body: bytes
+    etag: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # content-encoding -> bytes
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Cada content-encoding es una representación distinta: ETag fuerte propio (RFC 9110 8.8.3)
+        return self.etag if not encoding else f'{self.etag[:-1]}-{encoding}"'
+
+
+def _hashed_name(name: str, digest: str) -> str:
+    stem, dot, ext = name.rpartition(".")
+    return f"{stem}.{digest}.{ext}" if dot else f"{name}.{digest}"
+
+
+def _build_asset(path: Path) -> Asset:
+    body = path.read_bytes()
+    digest = hashlib.sha256(body).hexdigest()[:_HASH_LEN]
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type.endswith("javascript"):
+        media_type += "; charset=utf-8"
+
+    encoded: Dict[str, bytes] = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    try:  # brotli es opcional (sin él sólo se sirve gzip) y se importa recién acá
+        import brotli
+    except ImportError:  # pragma: no cover
+        brotli = None
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11)
+
+    return Asset(
+        name=path.name,
+        hashed_name=_hashed_name(path.name, digest),
+        media_type=media_type,
+        body=body,
+        etag=f'"{digest}"',
+        encoded=encoded,
+    )
+
+
+class AssetManifest:
+    """Manifest perezoso: hash y compresión se calculan en el primer uso, no al importar."""
+
+    def __init__(
+        self,
+        static_dir: Path,
+        names: Iterable[str] = FINGERPRINTED_ASSETS,
+        on_build: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.static_dir = static_dir
+        self.names = tuple(names)
+        self.on_build = on_build
+        self._by_name: Dict[str, Asset] = {}
+        self._by_hashed: Dict[str, Asset] = {}
+        self._built = False
+
+    def build(self) -> "AssetManifest":
+        if self._built:
+            return self
+        start = time.perf_counter()
+        for name in self.names:
+            path = self.static_dir / name
+            if not path.is_file():
+                continue
+            asset = _build_asset(path)
+            self._by_name[asset.name] = asset
+            self._by_hashed[asset.hashed_name] = asset
+        self._built = True
+        if self.on_build is not None:
+            self.on_build(time.perf_counter() - start)
+        return self
+
+    def url(self, name: str) -> str:
+        """URL para templates; si el asset no está fingerprinted cae a /static."""
+        asset = self.build()._by_name.get(name)
+        if asset is None:
+            return f"/static/{name}"
+        return f"{ASSETS_PREFIX}/{asset.hashed_name}"
+
+    def lookup(self, hashed_name: str) -> Optional[Asset]:
+        return self.build()._by_hashed.get(hashed_name)
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[token] = q
+    return out
+
+
+def negotiate(asset: Asset, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+    """Devuelve (content-encoding, body): la codificación aceptada con mayor q; br desempata."""
+    accepted = _accepted_encodings(accept_encoding or "")
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[str] = None
+    best_q = 0.0
+    for enc in ("br", "gzip"):
+        q = accepted.get(enc, wildcard)
+        if enc in asset.encoded and q > best_q:
+            best, best_q = enc, q
+    # identity sólo gana si el cliente la pide explícitamente con q mayor
+    if best is None or accepted.get("identity", 0.0) > best_q:
+        return None, asset.body
+    return best, asset.encoded[best]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match: lista separada por comas, "*" o tags W/ (comparación débil, RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
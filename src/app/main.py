@@ -1,17 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
 import os
 import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-import httpx
-from fastapi import FastAPI, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Body, FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from . import IMPORT_T0
+from .alerts import DEFAULT_MAX_RULES, AlertSink, StreamSink, WatcherRegistry, WebhookSink
+from .assets import ASSETS_PREFIX, IMMUTABLE_CACHE_CONTROL, AssetManifest, etag_matches, negotiate
+from .money import DEFAULT_ROUNDING, RATE_NOT_AVAILABLE, ROUNDING_MODES, AmountOutOfRange, ConversionEngine, to_decimal
+from .providers import RatesProvider, build_provider
+from .startup import StartupProfile
+from .tracing import TracingMiddleware, build_exporter, span
+
+# IMPORT_T0 se toma en app/__init__.py, antes de todos los imports de este módulo
+startup_profile = StartupProfile(IMPORT_T0)
+startup_profile.record("import", time.perf_counter() - IMPORT_T0)
+logger = logging.getLogger("uvicorn.error")
+
 APP_TITLE = "CRNCY - USD FX Dashboard"
 BASE_CCY = "USD"
 
@@ -35,8 +52,8 @@ CURRENCIES: List[Dict[str, str]] = [
     {"country": "South Africa", "flag": "🇿🇦", "currency": "ZAR"},
 ]
 
-FRANKFURTER_LATEST_URL = "https://api.frankfurter.dev/v1/latest"
-FRANKFURTER_CCY_URL = "https://api.frankfurter.dev/v1/currencies"
+# Fuente FX (configurable via FX_PROVIDERS / FX_FIXTURE_PATH, ver providers.py)
+provider: RatesProvider = build_provider()
 
 # Cache
 _RATES_TTL_SECONDS = 600
@@ -46,15 +63,90 @@ _cache: Dict[str, Any] = {
     "rates_payload": None,
     "ccy_ts": 0.0,
     "ccy_payload": None,
-    "trend": {},  # key: (base, sym, days) -> (ts, payload)
+    "engine": None,  # (rates dict del snapshot, ConversionEngine)
+    "trend": {},  # key: (base, sym, days, max_points) -> (ts, payload); max_points None = serie completa
 }
 
+# Alertas por par (ver alerts.py): se evalúan contra cada snapshot nuevo de fetch_rates
+# ALERTS_WEBHOOK_ALLOWLIST (hosts separados por coma) restringe los webhooks a esos hosts;
+# sin allowlist sólo se aceptan https:// hacia direcciones públicas.
+_WEBHOOK_ALLOWLIST = [h.strip() for h in os.getenv("ALERTS_WEBHOOK_ALLOWLIST", "").split(",") if h.strip()]
+watchers = WatcherRegistry(
+    BASE_CCY,
+    max_rules=int(os.getenv("ALERTS_MAX_RULES", str(DEFAULT_MAX_RULES))),
+    webhook_allowlist=_WEBHOOK_ALLOWLIST,
+)
+alert_stream = StreamSink()
+alert_sinks: List[AlertSink] = [WebhookSink(watchers, allowlist=_WEBHOOK_ALLOWLIST), alert_stream]
+
 # ---- Paths robustos ----
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = BASE_DIR / "templates"
 STATIC_DIR = BASE_DIR / "static"
 
-app = FastAPI(title=APP_TITLE)
+
+async def _warmup() -> None:
+    # Corre después de que uvicorn ya aceptó conexiones: deja template, assets y cache
+    # de rates listos antes del primer request real.
+    try:
+        _ensure_template_compiled()
+        await fetch_rates()
+    except Exception as ex:
+        logger.warning("startup warm-up failed: %s", ex)
+    finally:
+        startup_profile.log("warm-up")
+
+
+_ALERTS_RETRY_SECONDS = 5.0
+
+
+async def _alerts_refresh_loop() -> None:
+    # Con reglas registradas, refresca el snapshot al vencer el TTL aunque nadie abra el
+    # dashboard; fetch_rates evalúa las reglas contra cada snapshot nuevo. Duerme hasta
+    # que vence el snapshot actual (que un request puede haber renovado a mitad de camino).
+    # Sin reglas duerme un TTL completo; si el upstream falla, backoff exponencial hasta el TTL.
+    failures = 0
+    while True:
+        if not len(watchers):
+            failures = 0
+            await asyncio.sleep(_RATES_TTL_SECONDS)
+            continue
+
+        if failures:
+            delay = min(_ALERTS_RETRY_SECONDS * 2 ** (failures - 1), _RATES_TTL_SECONDS)
+        else:
+            delay = max(float(_cache["rates_ts"]) + _RATES_TTL_SECONDS - time.time(), 1.0)
+        await asyncio.sleep(delay)
+
+        if not len(watchers) or float(_cache["rates_ts"]) + _RATES_TTL_SECONDS > time.time():
+            failures = 0  # otro request ya renovó el snapshot
+            continue
+        try:
+            await fetch_rates()
+            failures = 0
+        except Exception as ex:
+            failures += 1
+            logger.warning("alerts refresh failed (attempt %d): %s", failures, ex)
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    tasks = [asyncio.create_task(_alerts_refresh_loop())]
+    if os.getenv("STARTUP_WARMUP", "1") != "0":
+        tasks.append(asyncio.create_task(_warmup()))
+    yield
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+    if span_exporter is not None:
+        await span_exporter.shutdown()
+
+
+_construct_t0 = time.perf_counter()
+app = FastAPI(title=APP_TITLE, lifespan=_lifespan)
+# Spans por request + header Server-Timing (cache/upstream/render/serialize), ver tracing.py
+span_exporter = build_exporter()
+app.add_middleware(TracingMiddleware, exporter=span_exporter)
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 app.mount(
@@ -63,12 +155,53 @@ app.mount(
     name="static",
 )
 
+# app.js / styles.css con hash de contenido + gzip/br precomprimidos (ver assets.py).
+# Se construye en el primer uso, no al importar.
+assets = AssetManifest(STATIC_DIR, on_build=lambda s: startup_profile.record("assets_build", s))
+templates.env.globals["static_url"] = assets.url
+startup_profile.record("app_construction", time.perf_counter() - _construct_t0)
+startup_profile.log("import")
+
+
+_template_compiled = False
+
+
+def _ensure_template_compiled() -> None:
+    global _template_compiled
+    if _template_compiled:
+        return
+    with startup_profile.phase("template_compile"):
+        templates.get_template("index.html")
+        assets.build()
+    _template_compiled = True
+
 
 @app.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.api_route(ASSETS_PREFIX + "/{name}", methods=["GET", "HEAD"])
+def static_asset(name: str, request: Request) -> Response:
+    asset = assets.lookup(name)
+    if asset is None:
+        return Response(status_code=404)
+
+    encoding, body = negotiate(asset, request.headers.get("accept-encoding", ""))
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": asset.etag_for(encoding), "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=asset.media_type, headers=headers)
+
+
+@app.get("/api/debug/startup")
+def api_debug_startup() -> Dict[str, Any]:
+    return startup_profile.report()
+
+
 @app.get("/api/version")
 def api_version() -> Dict[str, str]:
     # Si BUILD_TIME_UTC no fue inyectado, muestra hora actual UTC como fallback informativo
@@ -87,16 +220,15 @@ def api_version() -> Dict[str, str]:
 
 async def _get_supported_currencies() -> Dict[str, str]:
     now = time.time()
-    if _cache["ccy_payload"] is not None and (now - float(_cache["ccy_ts"])) < _CCY_TTL_SECONDS:
+    with span("cache.currencies", "cache") as s:
+        hit = _cache["ccy_payload"] is not None and (now - float(_cache["ccy_ts"])) < _CCY_TTL_SECONDS
+        if s is not None:
+            s.attributes["cache.hit"] = hit
+    if hit:
         return _cache["ccy_payload"]
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        r = await client.get(FRANKFURTER_CCY_URL)
-        r.raise_for_status()
-        payload = r.json()
-
-    if not isinstance(payload, dict):
-        payload = {}
+    with span("upstream.currencies", "upstream", provider=provider.name):
+        payload = await provider.currencies()
 
     _cache["ccy_ts"] = now
     _cache["ccy_payload"] = payload
@@ -110,39 +242,33 @@ def _symbols_from_config(supported: Dict[str, str]) -> List[str]:
 
 async def fetch_rates() -> Dict[str, Any]:
     now = time.time()
-    if _cache["rates_payload"] is not None and (now - float(_cache["rates_ts"])) < _RATES_TTL_SECONDS:
+    with span("cache.rates", "cache") as s:
+        hit = _cache["rates_payload"] is not None and (now - float(_cache["rates_ts"])) < _RATES_TTL_SECONDS
+        if s is not None:
+            s.attributes["cache.hit"] = hit
+    if hit:
         payload = dict(_cache["rates_payload"])
-        payload["_meta"] = {"cached": True, "cache_ttl_seconds": _RATES_TTL_SECONDS, "source": "frankfurter.dev/v1/latest"}
+        # source se conserva del fetch original (en fan-out, el proveedor que respondió)
+        meta = {"cache_ttl_seconds": _RATES_TTL_SECONDS, "source": provider.source("latest"), **payload.get("_meta", {})}
+        payload["_meta"] = {**meta, "cached": True}
         return payload
 
     supported = await _get_supported_currencies()
     symbols = _symbols_from_config(supported)
 
-    params: Dict[str, str] = {"base": BASE_CCY}
-    if symbols:
-        params["symbols"] = ",".join(symbols)
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        r = await client.get(FRANKFURTER_LATEST_URL, params=params)
-        # Si por alguna razón falla con symbols, hacemos fallback sin symbols
-        if r.status_code >= 400 and "symbols" in params:
-            r = await client.get(FRANKFURTER_LATEST_URL, params={"base": BASE_CCY})
-        r.raise_for_status()
-        payload = r.json()
-
-    if not isinstance(payload, dict):
-        payload = {"base": BASE_CCY, "date": None, "rates": {}}
-
-    # Filtra a lo que usamos
-    rates = payload.get("rates", {}) if isinstance(payload.get("rates"), dict) else {}
-    if symbols:
-        rates = {k: v for k, v in rates.items() if k in set(symbols)}
-
-    payload["rates"] = rates
-    payload["_meta"] = {"cached": False, "cache_ttl_seconds": _RATES_TTL_SECONDS, "source": "frankfurter.dev/v1/latest"}
+    fetch_t0 = time.perf_counter()
+    with span("upstream.latest", "upstream", provider=provider.name):
+        payload = await provider.latest(BASE_CCY, symbols)
+    startup_profile.record("first_upstream_fetch", time.perf_counter() - fetch_t0)
+    payload["_meta"] = {"cached": False, "cache_ttl_seconds": _RATES_TTL_SECONDS, "source": provider.source("latest")}
 
     _cache["rates_ts"] = now
     _cache["rates_payload"] = payload
+
+    alerts = watchers.evaluate(payload.get("rates", {}), payload.get("date"))
+    if alerts:
+        for sink in alert_sinks:
+            sink.deliver(alerts)
     return payload
 
 
@@ -184,14 +310,31 @@ def _compute_cross(amount: float, from_ccy: str, to_ccy: str, rates: Dict[str, A
 @app.get("/api/rates")
 async def api_rates() -> JSONResponse:
     payload = await fetch_rates()
-    return JSONResponse(payload)
+    with span("serialize.rates", "serialize"):
+        return JSONResponse(payload)
+
+
+_ROUNDING_PATTERN = "^(" + "|".join(ROUNDING_MODES) + ")$"
+_BATCH_MAX_ITEMS = 1000
+
+
+def _conversion_engine(data: Dict[str, Any]) -> ConversionEngine:
+    # Un engine por snapshot: se reconstruye sólo cuando fetch_rates trae un dict de rates nuevo
+    rates = data.get("rates", {}) if isinstance(data, dict) else {}
+    entry = _cache["engine"]
+    if entry is not None and entry[0] is rates:
+        return entry[1]
+    engine = ConversionEngine(BASE_CCY, rates, data.get("date") if isinstance(data, dict) else None)
+    _cache["engine"] = (rates, engine)
+    return engine
 
 
 @app.get("/api/convert")
 async def api_convert(
-    amount: float = Query(..., gt=0),
+    amount: Decimal = Query(..., gt=0),
     from_ccy: str = Query(..., alias="from"),
     to_ccy: str = Query(..., alias="to"),
+    rounding: str = Query(DEFAULT_ROUNDING, pattern=_ROUNDING_PATTERN),
 ) -> JSONResponse:
     data = await fetch_rates()
     rates = data.get("rates", {}) if isinstance(data, dict) else {}
@@ -209,77 +352,207 @@ async def api_convert(
             status_code=400,
         )
 
-    value = _compute_cross(amount, from_ccy_u, to_ccy_u, rates)
+    # Monto exacto (desde el Decimal del query, sin pasar por float) redondeado a la
+    # unidad menor de la moneda destino (ej. 0 decimales en JPY)
+    try:
+        exact = _conversion_engine(data).convert(amount, from_ccy_u, to_ccy_u, rounding)
+    except AmountOutOfRange as ex:
+        return JSONResponse({"error": str(ex), "from": from_ccy_u, "to": to_ccy_u}, status_code=400)
+
+    # `result` float se mantiene para clientes existentes
+    value = _compute_cross(float(amount), from_ccy_u, to_ccy_u, rates)
     if value is None:
         return JSONResponse(
-            {"error": "Rate not available for selected pair", "from": from_ccy_u, "to": to_ccy_u},
+            {"error": RATE_NOT_AVAILABLE, "from": from_ccy_u, "to": to_ccy_u},
             status_code=422,
         )
 
-    return JSONResponse(
-        {
-            "amount": amount,
-            "from": from_ccy_u,
-            "to": to_ccy_u,
-            "result": round(value, 6),
-            "base": BASE_CCY,
-            "fx_date": data.get("date"),
-        }
-    )
+    with span("serialize.convert", "serialize"):
+        return JSONResponse(
+            {
+                "amount": float(amount),
+                "from": from_ccy_u,
+                "to": to_ccy_u,
+                "result": round(value, 6),
+                "result_exact": str(exact) if exact is not None else None,
+                "rounding": rounding,
+                "base": BASE_CCY,
+                "fx_date": data.get("date"),
+            }
+        )
+
+
+@app.post("/api/convert/batch")
+async def api_convert_batch(
+    items: List[Dict[str, Any]] = Body(..., embed=True),
+    rounding: str = Query(DEFAULT_ROUNDING, pattern=_ROUNDING_PATTERN),
+) -> JSONResponse:
+    if len(items) > _BATCH_MAX_ITEMS:
+        return JSONResponse({"error": f"Too many items (max {_BATCH_MAX_ITEMS})"}, status_code=400)
+
+    data = await fetch_rates()
+    supported = await _get_supported_currencies()
+    supported_set = set(supported.keys()) | {BASE_CCY}
+    engine = _conversion_engine(data)
+
+    results: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []  # items válidos, en el mismo orden que `valid`
+    valid: List[Tuple[Decimal, str, str]] = []
+    for item in items:
+        # Montos como string para no perder precisión ("10.05"); también se aceptan números
+        amount = to_decimal(item.get("amount"))
+        from_ccy_u = str(item.get("from", "")).upper().strip()
+        to_ccy_u = str(item.get("to", "")).upper().strip()
+        out: Dict[str, Any] = {"amount": item.get("amount"), "from": from_ccy_u, "to": to_ccy_u}
+
+        if amount is None or amount <= 0:
+            out["error"] = "Invalid amount"
+        elif from_ccy_u not in supported_set or to_ccy_u not in supported_set:
+            out["error"] = "Unsupported currency by Frankfurter/ECB"
+        else:
+            pending.append(out)
+            valid.append((amount, from_ccy_u, to_ccy_u))
+        results.append(out)
+
+    # Un solo pase por el engine; errores por item (sin tasa, monto fuera de rango) no cortan el lote
+    for out, (value, error) in zip(pending, engine.convert_many(valid, rounding)):
+        if error is not None:
+            out["error"] = error
+        else:
+            out["result"] = str(value)
+
+    with span("serialize.convert_batch", "serialize"):
+        return JSONResponse({"base": BASE_CCY, "fx_date": data.get("date"), "rounding": rounding, "results": results})
+
+
+# max_points se redondea hacia abajo a uno de estos valores (sigue siendo un máximo): acota
+# las entradas de cache por (symbol, days) y evita una entrada distinta por cada ancho de pantalla
+_TREND_MAX_POINTS_BUCKETS = (50, 100, 200, 400, 800)
+
+
+def _snap_max_points(max_points: Optional[int]) -> Optional[int]:
+    if not max_points:
+        return None
+    fitting = [b for b in _TREND_MAX_POINTS_BUCKETS if b <= max_points]
+    # /api/trend rechaza valores menores al bucket más chico (ge=50)
+    return fitting[-1] if fitting else _TREND_MAX_POINTS_BUCKETS[0]
 
 
-async def _fetch_trend(base: str, symbol: str, days: int) -> Dict[str, Any]:
+async def _fetch_trend(base: str, symbol: str, days: int, max_points: Optional[int] = None) -> Dict[str, Any]:
     base = base.upper().strip()
     symbol = symbol.upper().strip()
     days = max(7, min(days, 180))
+    max_points = _snap_max_points(max_points)
 
-    key = (base, symbol, days)
+    key = (base, symbol, days, max_points)
     now = time.time()
-    entry = _cache["trend"].get(key)
-    if entry:
-        ts, payload = entry
-        if (now - float(ts)) < _RATES_TTL_SECONDS:
-            return payload
+    with span("cache.trend", "cache") as s:
+        entry = _cache["trend"].get(key)
+        hit = bool(entry) and (now - float(entry[0])) < _RATES_TTL_SECONDS
+        if s is not None:
+            s.attributes["cache.hit"] = hit
+    if hit:
+        return entry[1]
+
+    if max_points:
+        from .trend import lttb
+
+        # Downsampling sobre la serie completa (también cacheada)
+        full = await _fetch_trend(base, symbol, days)
+        if max_points >= len(full["points"]):
+            # Nada que reducir: se sirve la serie completa sin entrada de cache propia
+            return full
+        points = lttb([(p["date"], p["rate"]) for p in full["points"]], max_points)
+        out = {
+            **full,
+            "points": [{"date": d, "rate": r} for d, r in points],
+            "_meta": {**full["_meta"], "max_points": max_points, "total_points": len(full["points"])},
+        }
+        _cache["trend"][key] = (now, out)
+        return out
 
     end = date.today()
     start = end - timedelta(days=days)
 
-    url = f"https://api.frankfurter.dev/v1/{start.isoformat()}..{end.isoformat()}"
-    params = {"base": base, "symbols": symbol}
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        r = await client.get(url, params=params)
-        r.raise_for_status()
-        payload = r.json()
-
-    if not isinstance(payload, dict):
-        payload = {"rates": {}}
-
-    rates_by_day = payload.get("rates", {}) if isinstance(payload.get("rates"), dict) else {}
-    points: List[Tuple[str, float]] = []
-    for d, v in rates_by_day.items():
-        if isinstance(v, dict) and symbol in v:
-            fv = _to_float(v.get(symbol))
-            if fv is not None:
-                points.append((d, fv))
-    points.sort(key=lambda x: x[0])
+    with span("upstream.timeseries", "upstream", provider=provider.name, symbol=symbol, days=days):
+        points = await provider.timeseries(base, symbol, start, end)
 
     out = {
         "base": base,
         "symbol": symbol,
         "days": days,
         "points": [{"date": d, "rate": r} for d, r in points],
-        "_meta": {"source": "frankfurter.dev/v1/timeseries"},
+        "_meta": {"source": provider.source("timeseries")},
     }
     _cache["trend"][key] = (now, out)
     return out
 
 
 @app.get("/api/trend")
-async def api_trend(symbol: str, days: int = 30) -> JSONResponse:
+async def api_trend(
+    symbol: str,
+    days: int = 30,
+    max_points: Optional[int] = Query(None, ge=_TREND_MAX_POINTS_BUCKETS[0], le=2000),
+    fmt: str = Query("json", alias="format", pattern="^(json|bin)$"),
+) -> Response:
     # base fijo USD para el dashboard
-    out = await _fetch_trend(BASE_CCY, symbol, days)
-    return JSONResponse(out)
+    out = await _fetch_trend(BASE_CCY, symbol, days, max_points)
+    with span("serialize.trend", "serialize", format=fmt):
+        if fmt == "bin":
+            from .trend import TREND_BIN_MEDIA_TYPE, encode_points
+
+            # Formato compacto (ver trend.py); la metadata viaja en headers
+            return Response(
+                encode_points([(p["date"], p["rate"]) for p in out["points"]]),
+                media_type=TREND_BIN_MEDIA_TYPE,
+                headers={"X-Trend-Base": out["base"], "X-Trend-Symbol": out["symbol"], "X-Trend-Days": str(out["days"])},
+            )
+        return JSONResponse(out)
+
+
+@app.get("/api/alerts")
+def api_alerts() -> Dict[str, Any]:
+    return {"rules": [r.public() for r in watchers.rules()]}
+
+
+@app.post("/api/alerts")
+async def api_alerts_create(
+    pair: str = Query(...),
+    kind: str = Query(...),
+    value: float = Query(..., gt=0),
+    webhook: Optional[str] = Query(None),
+) -> JSONResponse:
+    try:
+        rule = watchers.add(pair, kind, value, webhook)
+    except ValueError as ex:
+        return JSONResponse({"error": str(ex)}, status_code=400)
+    return JSONResponse(rule.public(), status_code=201)
+
+
+@app.delete("/api/alerts/{rule_id}")
+def api_alerts_delete(rule_id: str) -> JSONResponse:
+    if not watchers.remove(rule_id):
+        return JSONResponse({"error": "Rule not found", "id": rule_id}, status_code=404)
+    return JSONResponse({"deleted": rule_id})
+
+
+@app.get("/api/alerts/stream")
+async def api_alerts_stream(request: Request) -> StreamingResponse:
+    queue = alert_stream.subscribe()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            while not await request.is_disconnected():
+                try:
+                    alert = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: alert\ndata: {json.dumps(alert)}\n\n"
+        finally:
+            alert_stream.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -313,18 +586,21 @@ async def home(request: Request) -> HTMLResponse:
     if build_time == "unknown":
         build_time = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "title": APP_TITLE,
-            "base": BASE_CCY,
-            "date": fx_date,
-            "rows": rows,
-            "dropdown": dropdown,
-            "error": error,
-            "build_tag": BUILD_TAG,
-            "git_sha": GIT_SHA,
-            "build_time_utc": build_time,
-        },
-    )
+    startup_profile.mark_first_request()
+    with span("render.index", "render"):
+        _ensure_template_compiled()
+        return templates.TemplateResponse(
+            "index.html",
+            {
+                "request": request,
+                "title": APP_TITLE,
+                "base": BASE_CCY,
+                "date": fx_date,
+                "rows": rows,
+                "dropdown": dropdown,
+                "error": error,
+                "build_tag": BUILD_TAG,
+                "git_sha": GIT_SHA,
+                "build_time_utc": build_time,
+            },
+        )
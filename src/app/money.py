@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import decimal
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Decimales de la unidad menor (ISO 4217). Lo que no esté acá usa DEFAULT_MINOR_UNITS.
+MINOR_UNITS: Dict[str, int] = {
+    "BHD": 3,
+    "CLP": 0,
+    "HUF": 2,
+    "IDR": 2,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "OMR": 3,
+    "TND": 3,
+    "VND": 0,
+}
+DEFAULT_MINOR_UNITS = 2
+
+ROUNDING_MODES: Dict[str, str] = {
+    "half_even": decimal.ROUND_HALF_EVEN,
+    "half_up": decimal.ROUND_HALF_UP,
+    "half_down": decimal.ROUND_HALF_DOWN,
+    "up": decimal.ROUND_UP,
+    "down": decimal.ROUND_DOWN,
+    "ceiling": decimal.ROUND_CEILING,
+    "floor": decimal.ROUND_FLOOR,
+}
+DEFAULT_ROUNDING = "half_even"
+
+RATE_NOT_AVAILABLE = "Rate not available for selected pair"
+
+# Precisión de trabajo para las tasas cruzadas (holgada respecto de las 5-6 cifras publicadas)
+_CONTEXT = decimal.Context(prec=28, rounding=decimal.ROUND_HALF_EVEN)
+_OUT_OF_RANGE = f"Amount out of range ({_CONTEXT.prec} significant digits max)"
+
+
+class AmountOutOfRange(ValueError):
+    pass
+
+
+def minor_units(ccy: str) -> int:
+    return MINOR_UNITS.get(ccy, DEFAULT_MINOR_UNITS)
+
+
+def to_decimal(x: Any) -> Optional[Decimal]:
+    # float -> str -> Decimal: conserva el valor publicado (0.9 y no 0.90000000000000002220...)
+    if isinstance(x, bool):  # Decimal(True) == 1: un `true` en el JSON no es un monto
+        return None
+    try:
+        d = Decimal(str(x)) if isinstance(x, float) else Decimal(x)
+    except (decimal.InvalidOperation, TypeError, ValueError):
+        return None
+    return d if d.is_finite() else None
+
+
+class ConversionEngine:
+    """Conversión exacta con redondeo a la unidad menor de la moneda destino.
+
+    Se construye una vez por snapshot de rates: tasas cruzadas en Decimal, cuantos
+    (0.01, 1, 0.001...) y contextos por modo de redondeo quedan precalculados, así el
+    hot path es una búsqueda en dict + una multiplicación + un quantize.
+    """
+
+    def __init__(self, base: str, rates: Dict[str, Any], fx_date: Optional[str] = None) -> None:
+        self.base = base
+        self.fx_date = fx_date
+
+        per_base: Dict[str, Decimal] = {base: Decimal(1)}
+        for ccy, r in rates.items():
+            d = to_decimal(r)
+            if d is not None and d > 0:
+                per_base[ccy] = d
+
+        # cross[(from, to)] = unidades de `to` por 1 `from` (vía base)
+        self._cross: Dict[Tuple[str, str], Decimal] = {
+            (f, t): Decimal(1) if f == t else _CONTEXT.divide(rt, rf)
+            for f, rf in per_base.items()
+            for t, rt in per_base.items()
+        }
+        self._quantum: Dict[str, Decimal] = {ccy: Decimal(1).scaleb(-minor_units(ccy)) for ccy in per_base}
+        self._contexts: Dict[str, decimal.Context] = {
+            name: decimal.Context(prec=_CONTEXT.prec, rounding=mode) for name, mode in ROUNDING_MODES.items()
+        }
+
+    def currencies(self) -> List[str]:
+        return sorted(self._quantum)
+
+    def cross_rate(self, from_ccy: str, to_ccy: str) -> Optional[Decimal]:
+        return self._cross.get((from_ccy, to_ccy))
+
+    def convert(self, amount: Decimal, from_ccy: str, to_ccy: str, rounding: str = DEFAULT_ROUNDING) -> Optional[Decimal]:
+        """Devuelve el monto en `to_ccy` redondeado a su unidad menor, o None si no hay tasa.
+
+        Lanza AmountOutOfRange si el resultado no entra en la precisión del contexto, y
+        KeyError si `rounding` no es un modo conocido (ver ROUNDING_MODES).
+        """
+        cross = self._cross.get((from_ccy, to_ccy))
+        if cross is None:
+            return None
+        ctx = self._contexts[rounding]
+        try:
+            return ctx.multiply(amount, cross).quantize(self._quantum[to_ccy], context=ctx)
+        except (decimal.InvalidOperation, decimal.Overflow):
+            raise AmountOutOfRange(_OUT_OF_RANGE) from None
+
+    def convert_many(
+        self, items: Iterable[Tuple[Decimal, str, str]], rounding: str = DEFAULT_ROUNDING
+    ) -> List[Tuple[Optional[Decimal], Optional[str]]]:
+        """Como convert() en lote: (monto, None) o (None, error) por item, sin cortar el lote."""
+        ctx = self._contexts[rounding]
+        cross = self._cross
+        quantum = self._quantum
+        out: List[Tuple[Optional[Decimal], Optional[str]]] = []
+        for amount, f, t in items:
+            c = cross.get((f, t))
+            if c is None:
+                out.append((None, RATE_NOT_AVAILABLE))
+                continue
+            try:
+                out.append((ctx.multiply(amount, c).quantize(quantum[t], context=ctx), None))
+            except (decimal.InvalidOperation, decimal.Overflow):
+                out.append((None, _OUT_OF_RANGE))
+        return out
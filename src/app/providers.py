@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import date
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("uvicorn.error")
+
+Point = Tuple[str, float]
+
+FRANKFURTER_BASE_URL = "https://api.frankfurter.dev/v1"
+_HTTP_TIMEOUT_SECONDS = 10.0
+
+
+class RatesProvider(ABC):
+    """Fuente de tasas FX.
+
+    Cada proveedor devuelve datos ya normalizados (no el payload crudo):
+      - latest(base, symbols)            -> {"amount": float, "base": str, "date": str|None, "rates": {ccy: float}}
+      - currencies()                     -> {ccy: nombre}
+      - timeseries(base, symbol, s, e)   -> [(fecha_iso, rate), ...] ordenado por fecha
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    async def latest(self, base: str, symbols: Sequence[str]) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def currencies(self) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    async def timeseries(self, base: str, symbol: str, start: date, end: date) -> List[Point]:
+        ...
+
+    def source(self, kind: str) -> str:
+        """Origen de la última respuesta de `kind` (latest/currencies/timeseries), para _meta.source."""
+        return f"{self.name}/{kind}"
+
+
+def _normalize_latest(payload: Any, base: str, symbols: Sequence[str]) -> Dict[str, Any]:
+    if not isinstance(payload, dict):
+        return {"amount": 1.0, "base": base, "date": None, "rates": {}}
+
+    rates = payload.get("rates", {}) if isinstance(payload.get("rates"), dict) else {}
+    if symbols:
+        wanted = set(symbols)
+        rates = {k: v for k, v in rates.items() if k in wanted}
+
+    # `amount` (unidades de base cotizadas) se conserva: es parte de la respuesta pública de /api/rates
+    return {
+        "amount": payload.get("amount", 1.0),
+        "base": payload.get("base", base),
+        "date": payload.get("date"),
+        "rates": rates,
+    }
+
+
+def _normalize_currencies(payload: Any) -> Dict[str, str]:
+    return payload if isinstance(payload, dict) else {}
+
+
+def _normalize_timeseries(payload: Any, symbol: str) -> List[Point]:
+    rates_by_day = payload.get("rates", {}) if isinstance(payload, dict) else {}
+    if not isinstance(rates_by_day, dict):
+        return []
+
+    points: List[Point] = []
+    for d, v in rates_by_day.items():
+        if isinstance(v, dict) and symbol in v:
+            try:
+                points.append((d, float(v[symbol])))
+            except (TypeError, ValueError):
+                continue
+    points.sort(key=lambda x: x[0])
+    return points
+
+
+class FrankfurterProvider(RatesProvider):
+    name = "frankfurter.dev/v1"
+
+    def __init__(self, base_url: str = FRANKFURTER_BASE_URL, timeout: float = _HTTP_TIMEOUT_SECONDS) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        if self.base_url != FRANKFURTER_BASE_URL:
+            # Instancia propia/espejo: se distingue por host en _meta.source y en los spans
+            self.name = self.base_url.split("://", 1)[-1]
+
+    async def latest(self, base: str, symbols: Sequence[str]) -> Dict[str, Any]:
+        url = f"{self.base_url}/latest"
+        params: Dict[str, str] = {"base": base}
+        if symbols:
+            params["symbols"] = ",".join(symbols)
+
+        import httpx  # import diferido: no pesa en el arranque en frío
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            r = await client.get(url, params=params)
+            # Si por alguna razón falla con symbols, hacemos fallback sin symbols
+            if r.status_code >= 400 and "symbols" in params:
+                r = await client.get(url, params={"base": base})
+            r.raise_for_status()
+            payload = r.json()
+
+        return _normalize_latest(payload, base, symbols)
+
+    async def currencies(self) -> Dict[str, str]:
+        import httpx
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            r = await client.get(f"{self.base_url}/currencies")
+            r.raise_for_status()
+            payload = r.json()
+
+        return _normalize_currencies(payload)
+
+    async def timeseries(self, base: str, symbol: str, start: date, end: date) -> List[Point]:
+        url = f"{self.base_url}/{start.isoformat()}..{end.isoformat()}"
+        params = {"base": base, "symbols": symbol}
+
+        import httpx
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            r = await client.get(url, params=params)
+            r.raise_for_status()
+            payload = r.json()
+
+        return _normalize_timeseries(payload, symbol)
+
+
+class FixtureProvider(RatesProvider):
+    """Proveedor offline que reproduce datos grabados desde un archivo JSON.
+
+    Formato (mismo shape que Frankfurter, por sección):
+      {"currencies": {...}, "latest": {...}, "timeseries": {"rates": {fecha: {ccy: rate}}}}
+
+    Las series se reproducen anclando la ventana pedida a la última fecha grabada,
+    así un fixture viejo sigue sirviendo para tests de carga.
+    """
+
+    name = "fixture"
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._data = data if isinstance(data, dict) else {}
+        return self._data
+
+    async def latest(self, base: str, symbols: Sequence[str]) -> Dict[str, Any]:
+        return _normalize_latest(self._load().get("latest"), base, symbols)
+
+    async def currencies(self) -> Dict[str, str]:
+        return _normalize_currencies(self._load().get("currencies"))
+
+    async def timeseries(self, base: str, symbol: str, start: date, end: date) -> List[Point]:
+        points = _normalize_timeseries(self._load().get("timeseries"), symbol)
+        if not points:
+            return []
+
+        last = date.fromisoformat(points[-1][0])
+        first = (last - (end - start)).isoformat()
+        return [p for p in points if p[0] >= first]
+
+
+def _has_data(result: Any) -> bool:
+    if isinstance(result, dict) and "rates" in result:
+        return bool(result["rates"])
+    return bool(result)
+
+
+class FanOutProvider(RatesProvider):
+    """Consulta varios proveedores en paralelo y se queda con la primera respuesta válida.
+
+    Una respuesta es válida si no lanza excepción y trae datos. Si ninguno responde
+    con datos se devuelve la última respuesta vacía, o se relanza el último error.
+    source(kind) indica qué proveedor respondió la última llamada de cada tipo.
+    """
+
+    def __init__(self, providers: Sequence[RatesProvider]) -> None:
+        if not providers:
+            raise ValueError("FanOutProvider requires at least one provider")
+        self.providers = list(providers)
+        self.name = "fanout(" + ",".join(p.name for p in self.providers) + ")"
+        self._answered: Dict[str, RatesProvider] = {}
+
+    def source(self, kind: str) -> str:
+        answered = self._answered.get(kind)
+        return super().source(kind) if answered is None else f"{answered.source(kind)} via {self.name}"
+
+    async def _first_valid(self, kind: str, call: Callable[[RatesProvider], Awaitable[Any]]) -> Any:
+        tasks = {asyncio.ensure_future(call(p)): p for p in self.providers}
+        pending = set(tasks)
+        last_error: Optional[BaseException] = None
+        fallback: Any = None
+        have_fallback = False
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    result = task.result()
+                    if _has_data(result):
+                        self._answered[kind] = tasks[task]
+                        return result
+                    fallback, have_fallback = result, True
+                    self._answered[kind] = tasks[task]
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if have_fallback:
+            return fallback
+        assert last_error is not None
+        raise last_error
+
+    async def latest(self, base: str, symbols: Sequence[str]) -> Dict[str, Any]:
+        return await self._first_valid("latest", lambda p: p.latest(base, symbols))
+
+    async def currencies(self) -> Dict[str, str]:
+        return await self._first_valid("currencies", lambda p: p.currencies())
+
+    async def timeseries(self, base: str, symbol: str, start: date, end: date) -> List[Point]:
+        return await self._first_valid("timeseries", lambda p: p.timeseries(base, symbol, start, end))
+
+
+def build_provider(spec: Optional[str] = None, fixture_path: Optional[str] = None) -> RatesProvider:
+    """Construye el proveedor a partir de FX_PROVIDERS.
+
+    Ej. "frankfurter", "fixture", o varios en fan-out: "frankfurter,frankfurter:https://fx.interno/v1"
+    (instancia propia de Frankfurter). No mezclar "fixture" con proveedores en vivo: responde
+    sin I/O, así que siempre gana la carrera y nunca se servirían datos en vivo.
+    """
+    spec = spec if spec is not None else os.getenv("FX_PROVIDERS", "frankfurter")
+    fixture_path = fixture_path if fixture_path is not None else os.getenv("FX_FIXTURE_PATH", "")
+
+    providers: List[RatesProvider] = []
+    for entry in [s.strip() for s in spec.split(",") if s.strip()]:
+        name, _, arg = entry.partition(":")
+        name = name.lower()
+        if name == "frankfurter":
+            providers.append(FrankfurterProvider(arg or os.getenv("FRANKFURTER_BASE_URL", FRANKFURTER_BASE_URL)))
+        elif name == "fixture":
+            if not fixture_path:
+                raise ValueError("FX_FIXTURE_PATH is required for the fixture provider")
+            providers.append(FixtureProvider(fixture_path))
+        else:
+            raise ValueError(f"Unknown FX provider: {name}")
+
+    if not providers:
+        providers.append(FrankfurterProvider())
+    if len(providers) > 1 and any(isinstance(p, FixtureProvider) for p in providers):
+        logger.warning("FX_PROVIDERS=%s: the fixture provider always answers first, live data will not be served", spec)
+    return providers[0] if len(providers) == 1 else FanOutProvider(providers)
+
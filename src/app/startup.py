@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Logger de uvicorn: es el que sale en los logs de Cloud Run sin configuración extra
+logger = logging.getLogger("uvicorn.error")
+
+
+class StartupProfile:
+    """Tiempos de arranque en frío (import, construcción de la app, template, primer fetch).
+
+    Cada fase se registra una sola vez: lo que interesa es el costo del primer uso.
+    """
+
+    def __init__(self, t0: Optional[float] = None) -> None:
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.first_request_ms: Optional[float] = None
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases.setdefault(name, round(seconds * 1000, 3))
+
+    def done(self, name: str) -> bool:
+        return name in self.phases
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def mark_first_request(self) -> None:
+        if self.first_request_ms is None:
+            self.first_request_ms = round((time.perf_counter() - self.t0) * 1000, 3)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "phases_ms": dict(self.phases),
+            "first_request_after_ms": self.first_request_ms,
+            "uptime_ms": round((time.perf_counter() - self.t0) * 1000, 3),
+        }
+
+    def log(self, label: str) -> None:
+        parts = " ".join(f"{k}={v}ms" for k, v in self.phases.items())
+        logger.info("startup %s: %s", label, parts)
@@ -104,7 +104,113 @@
     }
   }
 
+  // ---- Trend modal ----
+  const modalEl = $("modal");
+  const modalTitle = $("modalTitle");
+  const modalMeta = $("modalMeta");
+  const canvasEl = $("trendCanvas");
+  const TREND_DAYS = 30;
+  const DAY_MS = 86_400_000;
+  const TREND_MAX_POINTS_BUCKETS = [100, 200, 400, 800];
+
+  // Formato binario de /api/trend?format=bin (ver src/app/trend.py):
+  // uint32 n | int32 day0 | uint16 offsets[n] | float64 rates[n] (little-endian)
+  function decodeTrend(buf) {
+    const view = new DataView(buf);
+    const n = view.getUint32(0, true);
+    const day0 = view.getInt32(4, true);
+    const ratesAt = 8 + 2 * n;
+    const points = new Array(n);
+    for (let i = 0; i < n; i++) {
+      const day = day0 + view.getUint16(8 + 2 * i, true);
+      points[i] = {
+        day,
+        date: new Date(day * DAY_MS).toISOString().slice(0, 10),
+        rate: view.getFloat64(ratesAt + 8 * i, true),
+      };
+    }
+    return points;
+  }
+
+  async function fetchTrend(symbol) {
+    // Un punto por píxel alcanza; el servidor hace el downsampling. Se usan pocos
+    // valores fijos para que todos los clientes compartan la misma entrada de cache.
+    const width = Math.round(canvasEl?.clientWidth || canvasEl?.width || 300);
+    const maxPoints = TREND_MAX_POINTS_BUCKETS.find((b) => width <= b) || TREND_MAX_POINTS_BUCKETS[TREND_MAX_POINTS_BUCKETS.length - 1];
+    const qs = new URLSearchParams({ symbol, days: String(TREND_DAYS), max_points: String(maxPoints), format: "bin" });
+    const res = await fetch(`/api/trend?${qs}`, { headers: { "accept": "application/octet-stream" } });
+    if (!res.ok) throw new Error(`GET /api/trend failed (${res.status})`);
+    return decodeTrend(await res.arrayBuffer());
+  }
+
+  function drawTrend(points) {
+    if (!canvasEl) return;
+    const ctx = canvasEl.getContext("2d");
+    const w = canvasEl.width;
+    const h = canvasEl.height;
+    const pad = 24;
+    ctx.clearRect(0, 0, w, h);
+    if (points.length < 2) return;
+
+    let min = Infinity;
+    let max = -Infinity;
+    for (const p of points) {
+      if (p.rate < min) min = p.rate;
+      if (p.rate > max) max = p.rate;
+    }
+    const span = (max - min) || 1;
+    // Eje x en días reales (no por índice): LTTB y los fines de semana/feriados dejan
+    // huecos irregulares que el gráfico tiene que respetar
+    const firstDay = points[0].day;
+    const daySpan = (points[points.length - 1].day - firstDay) || 1;
+    const x = (day) => pad + ((day - firstDay) / daySpan) * (w - 2 * pad);
+    const y = (r) => h - pad - ((r - min) / span) * (h - 2 * pad);
+
+    ctx.lineWidth = 2;
+    ctx.strokeStyle = "#4f8cff";
+    ctx.beginPath();
+    points.forEach((p, i) => (i === 0 ? ctx.moveTo(x(p.day), y(p.rate)) : ctx.lineTo(x(p.day), y(p.rate))));
+    ctx.stroke();
+  }
+
+  function setModal(open) {
+    if (!modalEl) return;
+    modalEl.classList.toggle("hidden", !open);
+    modalEl.setAttribute("aria-hidden", open ? "false" : "true");
+  }
+
+  async function openTrend(symbol) {
+    setModal(true);
+    if (modalTitle) modalTitle.textContent = `Trend USD → ${symbol} (${TREND_DAYS}d)`;
+    if (modalMeta) modalMeta.textContent = "Cargando...";
+    drawTrend([]);
+    try {
+      const points = await fetchTrend(symbol);
+      drawTrend(points);
+      if (modalMeta) {
+        modalMeta.textContent = points.length
+          ? `${points[0].date} → ${points[points.length - 1].date} · ${points.length} puntos · último ${formatNumber(points[points.length - 1].rate)}`
+          : "Sin datos para el período.";
+      }
+    } catch (e) {
+      if (modalMeta) modalMeta.textContent = (e && e.message) ? e.message : String(e);
+      console.error(e);
+    }
+  }
+
+  function bindTrend() {
+    document.querySelectorAll(".trend").forEach((el) => {
+      el.addEventListener("click", (ev) => {
+        ev.preventDefault();
+        openTrend(el.dataset.symbol);
+      });
+    });
+    $("modalClose")?.addEventListener("click", () => setModal(false));
+    $("modalX")?.addEventListener("click", () => setModal(false));
+  }
+
   function bind() {
+    bindTrend();
     if (!btnEl) return;
 
     btnEl.addEventListener("click", (ev) => {
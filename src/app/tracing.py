@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+# Fases del header Server-Timing (en este orden)
+PHASES = ("cache", "upstream", "render", "serialize")
+SERVICE_NAME = "crncy-api"
+_TRACEPARENT_RE = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    phase: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_ns: int = 0
+    end_ns: int = 0
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    root: Span
+    spans: List[Span] = field(default_factory=list)
+    stack: List[str] = field(default_factory=list)
+
+    def server_timing(self) -> str:
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            if s.phase:
+                totals[s.phase] = totals.get(s.phase, 0.0) + s.duration_ms
+        parts = [f"{p};dur={totals[p]:.3f}" for p in PHASES if p in totals]
+        parts.append(f"total;dur={(time.time_ns() - self.root.start_ns) / 1e6:.3f}")
+        return ", ".join(parts)
+
+
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("crncy_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, phase: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Span hijo del request actual; fuera de un request no registra nada."""
+    trace = _current.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = trace.stack[-1] if trace.stack else trace.root.span_id
+    s = Span(name, trace.trace_id, secrets.token_hex(8), parent, phase, dict(attributes), time.time_ns())
+    trace.stack.append(s.span_id)
+    try:
+        yield s
+    except BaseException as ex:
+        s.error = repr(ex)
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        trace.stack.pop()
+        trace.spans.append(s)
+
+
+# ---- Export (OTLP/JSON, compatible con un OpenTelemetry Collector) ----
+
+def _otlp_value(v: Any) -> Dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+
+def _otlp_span(s: Span, root: bool) -> Dict[str, Any]:
+    attrs = dict(s.attributes)
+    if s.phase:
+        attrs["crncy.phase"] = s.phase
+    out: Dict[str, Any] = {
+        "traceId": s.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        # SpanKind: 2 = SERVER (request), 3 = CLIENT (upstream), 1 = INTERNAL
+        "kind": 2 if root else 3 if s.phase == "upstream" else 1,
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attrs.items()],
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+    }
+    if s.parent_id:
+        out["parentSpanId"] = s.parent_id
+    return out
+
+
+def to_otlp(traces: List[Trace]) -> Dict[str, Any]:
+    spans = []
+    for t in traces:
+        spans.append(_otlp_span(t.root, True))
+        spans.extend(_otlp_span(s, False) for s in t.spans)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, trace: Trace) -> None:
+        ...
+
+    async def shutdown(self) -> None:
+        """Vacía lo pendiente; se llama desde el lifespan al apagar."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Una línea OTLP/JSON por request (se puede reenviar al collector con el receiver otlpjsonfile).
+
+    export() sólo encola: serializar y escribir ocurre en un thread aparte, por lotes,
+    para no bloquear el event loop en el hot path.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str | Path, flush_seconds: float = 1.0) -> None:
+        self.path = Path(path)
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-file-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put(trace)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch: List[Trace] = []
+            try:
+                item = self._queue.get(timeout=self.flush_seconds)
+                while True:
+                    if item is self._STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Trace]) -> None:
+        lines = "".join(json.dumps(to_otlp([t]), separators=(",", ":")) + "\n" for t in batch)
+        try:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as ex:
+            logger.warning("trace export to %s failed: %s", self.path, ex)
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+
+    async def shutdown(self) -> None:
+        await asyncio.to_thread(self.close)
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """POST OTLP/JSON a {endpoint}/v1/traces, por lotes: al llenar el lote o cada flush_seconds."""
+
+    def __init__(self, endpoint: str, batch_size: int = 64, flush_seconds: float = 5.0) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._buffer: List[Trace] = []
+        self._timer: Optional["asyncio.Task[None]"] = None
+        self._tasks: set = set()
+
+    def export(self, trace: Trace) -> None:
+        self._buffer.append(trace)
+        if self._timer is None:
+            # Timer propio: lo que quede en el buffer sale aunque la instancia quede ociosa
+            self._timer = asyncio.get_running_loop().create_task(self._flush_loop())
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        task = asyncio.get_running_loop().create_task(self._post(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            self._flush()
+
+    async def shutdown(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _post(self, batch: List[Trace]) -> None:
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                r = await client.post(self.url, json=to_otlp(batch))
+                r.raise_for_status()
+        except Exception as ex:
+            logger.warning("trace export to %s failed: %s", self.url, ex)
+
+
+def build_exporter() -> Optional[SpanExporter]:
+    """TRACE_FILE=/ruta.jsonl u OTEL_EXPORTER_OTLP_ENDPOINT=http://collector:4318 (si ninguno, sin export)."""
+    path = os.getenv("TRACE_FILE", "")
+    if path:
+        return FileSpanExporter(path)
+    endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+    if endpoint:
+        return OTLPHttpSpanExporter(endpoint)
+    return None
+
+
+class TracingMiddleware:
+    """ASGI: abre un trace por request, agrega Server-Timing a la respuesta y exporta los spans."""
+
+    def __init__(self, app: Any, exporter: Optional[SpanExporter] = None) -> None:
+        self.app = app
+        self.exporter = exporter
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id = secrets.token_hex(16), None
+        for k, v in scope.get("headers", []):
+            if k == b"traceparent":
+                m = _TRACEPARENT_RE.match(v.decode("latin-1").strip())
+                if m:
+                    trace_id, parent_id = m.group(1), m.group(2)
+                break
+
+        root = Span(
+            f"{scope['method']} {scope['path']}",
+            trace_id,
+            secrets.token_hex(8),
+            parent_id,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+            start_ns=time.time_ns(),
+        )
+        trace = Trace(trace_id, root)
+        token = _current.set(trace)
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except BaseException as ex:
+            root.error = repr(ex)
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            _current.reset(token)
+            if self.exporter is not None:
+                try:
+                    self.exporter.export(trace)
+                except Exception as ex:
+                    logger.warning("trace export failed: %s", ex)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import struct
+from datetime import date
+from typing import List, Sequence, Tuple
+
+Point = Tuple[str, float]
+
+# Formato binario de /api/trend?format=bin (little-endian):
+#   uint32  n           cantidad de puntos
+#   int32   day0        primer día, en días desde 1970-01-01
+#   uint16  offsets[n]  días desde day0
+#   float64 rates[n]
+TREND_BIN_MEDIA_TYPE = "application/octet-stream"
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Downsampling Largest-Triangle-Three-Buckets (conserva la forma visual de la serie)."""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    xs = [float(date.fromisoformat(d).toordinal()) for d, _ in points]
+    ys = [r for _, r in points]
+
+    out: List[Point] = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Promedio del bucket siguiente (punto "c" del triángulo)
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        span = nxt_end - nxt_start
+        avg_x = sum(xs[nxt_start:nxt_end]) / span
+        avg_y = sum(ys[nxt_start:nxt_end]) / span
+
+        # Punto del bucket actual con el triángulo de mayor área
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+
+        out.append(points[best])
+        a = best
+
+    out.append(points[-1])
+    return out
+
+
+def encode_points(points: Sequence[Point]) -> bytes:
+    n = len(points)
+    if n == 0:
+        return struct.pack("<Ii", 0, 0)
+
+    days = [date.fromisoformat(d).toordinal() - _EPOCH_ORDINAL for d, _ in points]
+    day0 = days[0]
+    return (
+        struct.pack("<Ii", n, day0)
+        + struct.pack(f"<{n}H", *[d - day0 for d in days])
+        + struct.pack(f"<{n}d", *[r for _, r in points])
+    )
+
+
+def decode_points(blob: bytes) -> List[Point]:
+    n, day0 = struct.unpack_from("<Ii", blob, 0)
+    offsets = struct.unpack_from(f"<{n}H", blob, 8)
+    rates = struct.unpack_from(f"<{n}d", blob, 8 + 2 * n)
+    return [
+        (date.fromordinal(_EPOCH_ORDINAL + day0 + off).isoformat(), r)
+        for off, r in zip(offsets, rates)
+    ]
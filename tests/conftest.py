@@ -12,6 +12,21 @@ if str(SRC) not in sys.path:
 import app.main as main  # noqa: E402
 
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: mide tiempos; sólo corre con pytest -m benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Opt-in: las aserciones por tiempo fallan al azar en máquinas cargadas y bajo coverage.
+    # CI las corre en un paso propio, sin --cov (ver deploy-cloudrun.yml).
+    if "benchmark" in (config.option.markexpr or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with pytest -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(autouse=True)
 def reset_cache():
     original = copy.deepcopy(main._cache)
@@ -0,0 +1,268 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.alerts as alerts
+import app.main as main
+
+client = TestClient(main.app)
+
+
+class _RecordingSink(alerts.AlertSink):
+    def __init__(self):
+        self.batches = []
+
+    def deliver(self, batch):
+        self.batches.append(batch)
+
+
+def test_threshold_rules_fire_only_when_crossed():
+    reg = alerts.WatcherRegistry("USD")
+    up = reg.add("USD/MXN", "above", 18.0)
+    down = reg.add("usd/mxn", "below", 17.0)
+    far = reg.add("USD/MXN", "above", 25.0)
+
+    assert reg.evaluate({"MXN": 17.5}) == []  # primer snapshot: sólo baseline
+
+    fired = reg.evaluate({"MXN": 18.2}, "2026-01-20")
+    assert [a["id"] for a in fired] == [up.id]
+    assert fired[0]["previous"] == 17.5
+    assert fired[0]["fx_date"] == "2026-01-20"
+
+    assert reg.evaluate({"MXN": 18.3}) == []  # ya estaba arriba: no re-dispara
+
+    assert [a["id"] for a in reg.evaluate({"MXN": 16.9})] == [down.id]
+    assert far.id not in {a["id"] for a in reg.evaluate({"MXN": 24.0})}
+
+
+def test_pct_rule_and_cross_pair():
+    reg = alerts.WatcherRegistry("USD")
+    small = reg.add("EUR/BRL", "pct", 1.0)
+    big = reg.add("EUR/BRL", "pct", 5.0)
+
+    reg.evaluate({"EUR": 0.9, "BRL": 5.4})  # EUR/BRL = 6.0
+    fired = reg.evaluate({"EUR": 0.9, "BRL": 5.52})  # EUR/BRL = 6.133 (+2.2%)
+    assert [a["id"] for a in fired] == [small.id]
+    assert fired[0]["change_pct"] == pytest.approx(2.2222, rel=1e-3)
+    assert big.id not in {a["id"] for a in fired}
+
+
+def test_only_pairs_of_changed_symbols_are_evaluated():
+    reg = alerts.WatcherRegistry("USD")
+    reg.add("USD/JPY", "pct", 0.1)
+    mxn = reg.add("USD/MXN", "pct", 0.1)
+
+    reg.evaluate({"JPY": 150.0, "MXN": 17.0})
+    fired = reg.evaluate({"JPY": 150.0, "MXN": 17.5})
+    assert [a["id"] for a in fired] == [mxn.id]
+
+
+def test_add_validation_and_remove():
+    reg = alerts.WatcherRegistry("USD")
+    with pytest.raises(ValueError):
+        reg.add("USDMXN", "above", 1.0)
+    with pytest.raises(ValueError):
+        reg.add("USD/MXN", "sideways", 1.0)
+
+    rule = reg.add("USD/MXN", "above", 18.0)
+    assert reg.remove(rule.id) is True
+    assert reg.remove(rule.id) is False
+    assert len(reg) == 0
+    reg.evaluate({"MXN": 17.0})
+    assert reg.evaluate({"MXN": 19.0}) == []
+
+
+def test_stream_sink_fans_out_to_subscribers():
+    async def run():
+        sink = alerts.StreamSink(maxsize=1)
+        q = sink.subscribe()
+        sink.deliver([{"id": "1"}, {"id": "2"}])  # la segunda se descarta (cola llena)
+        got = q.get_nowait()
+        sink.unsubscribe(q)
+        sink.deliver([{"id": "3"}])
+        return got, q.qsize()
+
+    assert asyncio.run(run()) == ({"id": "1"}, 0)
+
+
+def test_fetch_rates_delivers_alerts_to_sinks(monkeypatch):
+    reg = alerts.WatcherRegistry("USD")
+    sink = _RecordingSink()
+    monkeypatch.setattr(main, "watchers", reg)
+    monkeypatch.setattr(main, "alert_sinks", [sink])
+
+    snapshots = iter([{"MXN": 17.9}, {"MXN": 18.1}])
+
+    async def fake_supported():
+        return {"USD": "US Dollar", "MXN": "Peso"}
+
+    async def fake_latest(base, symbols):
+        return {"base": base, "date": "2026-01-20", "rates": next(snapshots)}
+
+    monkeypatch.setattr(main, "_get_supported_currencies", fake_supported)
+    monkeypatch.setattr(main.provider, "latest", fake_latest)
+
+    r = client.post("/api/alerts?pair=USD/MXN&kind=above&value=18")
+    assert r.status_code == 201
+    assert client.get("/api/alerts").json()["rules"][0]["pair"] == "USD/MXN"
+
+    asyncio.run(main.fetch_rates())
+    main._cache["rates_ts"] = 0.0  # fuerza snapshot nuevo
+    asyncio.run(main.fetch_rates())
+
+    assert len(sink.batches) == 1
+    assert sink.batches[0][0]["rate"] == 18.1
+
+    assert client.delete(f"/api/alerts/{r.json()['id']}").status_code == 200
+    assert client.delete("/api/alerts/999").status_code == 404
+
+
+def test_api_alerts_rejects_invalid_rule():
+    r = client.post("/api/alerts?pair=MXN&kind=above&value=18")
+    assert r.status_code == 400
+    assert "error" in r.json()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://hooks.example.com/x",
+        "https://localhost/x",
+        "https://127.0.0.1/x",
+        "https://169.254.169.254/computeMetadata/v1/",
+        "https://10.0.0.5/x",
+        "https://[::1]/x",
+        "https://metadata.google.internal/x",
+        "file:///etc/passwd",
+    ],
+)
+def test_webhook_rejects_non_https_and_private_hosts(url):
+    reg = alerts.WatcherRegistry("USD")
+    with pytest.raises(ValueError):
+        reg.add("USD/MXN", "above", 18.0, url)
+    assert len(reg) == 0
+
+
+def test_webhook_allowlist_and_public_https():
+    assert alerts.WatcherRegistry("USD").add("USD/MXN", "above", 18.0, "https://8.8.8.8/hook").webhook
+
+    reg = alerts.WatcherRegistry("USD", webhook_allowlist=["hooks.example.com"])
+    assert reg.add("USD/MXN", "above", 18.0, "https://hooks.example.com/a").webhook == "https://hooks.example.com/a"
+    with pytest.raises(ValueError):
+        reg.add("USD/MXN", "above", 18.0, "https://other.example.com/a")
+
+
+def test_registry_caps_number_of_rules():
+    reg = alerts.WatcherRegistry("USD", max_rules=2)
+    reg.add("USD/MXN", "above", 18.0)
+    reg.add("USD/MXN", "above", 19.0)
+    with pytest.raises(ValueError, match="Too many"):
+        reg.add("USD/MXN", "above", 20.0)
+
+
+def test_webhook_sink_skips_hosts_resolving_to_private_addresses(monkeypatch):
+    posted = []
+
+    class _Client:
+        def __init__(self, timeout=10.0):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def post(self, url, json=None):
+            posted.append(url)
+
+    async def fake_resolves(host):
+        return host == "public.example.com"
+
+    monkeypatch.setattr(httpx, "AsyncClient", _Client)
+    monkeypatch.setattr(alerts, "resolves_to_public", fake_resolves)
+
+    sink = alerts.WebhookSink(alerts.WatcherRegistry("USD"))
+    asyncio.run(sink._post("https://rebind.example.com/x", [{"id": "1"}]))
+    asyncio.run(sink._post("https://public.example.com/x", [{"id": "1"}]))
+    assert posted == ["https://public.example.com/x"]
+
+
+def test_refresh_loop_sleeps_until_current_snapshot_expires(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        raise asyncio.CancelledError
+
+    reg = alerts.WatcherRegistry("USD")
+    reg.add("USD/MXN", "above", 18.0)
+    main._cache["rates_ts"] = main.time.time() - 100  # renovado hace 100s por un request
+    monkeypatch.setattr(main, "watchers", reg)
+    monkeypatch.setattr(main.asyncio, "sleep", fake_sleep)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main._alerts_refresh_loop())
+    assert main._RATES_TTL_SECONDS - 101 < sleeps[0] <= main._RATES_TTL_SECONDS - 100
+
+
+def _run_refresh_loop(monkeypatch, max_sleeps):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) >= max_sleeps:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(main.asyncio, "sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main._alerts_refresh_loop())
+    return sleeps
+
+
+def test_refresh_loop_without_rules_sleeps_full_ttl(monkeypatch):
+    monkeypatch.setattr(main, "watchers", alerts.WatcherRegistry("USD"))
+    main._cache["rates_ts"] = 0.0  # snapshot vencido
+
+    assert _run_refresh_loop(monkeypatch, 3) == [main._RATES_TTL_SECONDS] * 3
+
+
+def test_refresh_loop_backs_off_exponentially_on_upstream_failure(monkeypatch):
+    reg = alerts.WatcherRegistry("USD")
+    reg.add("USD/MXN", "above", 18.0)
+    calls = []
+
+    async def failing_fetch_rates():
+        calls.append(1)
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(main, "watchers", reg)
+    monkeypatch.setattr(main, "fetch_rates", failing_fetch_rates)
+    main._cache["rates_ts"] = 0.0
+
+    sleeps = _run_refresh_loop(monkeypatch, 10)
+    retry = main._ALERTS_RETRY_SECONDS
+    assert sleeps[:5] == [1.0, retry, retry * 2, retry * 4, retry * 8]
+    assert sleeps[-1] == main._RATES_TTL_SECONDS  # tope en el TTL
+    assert len(calls) == 9
+
+
+def test_rule_ids_unguessable_and_webhook_masked(monkeypatch):
+    reg = alerts.WatcherRegistry("USD")
+    monkeypatch.setattr(main, "watchers", reg)
+
+    secret = "https://8.8.8.8/services/T000/B000/secret-token"
+    r = client.post("/api/alerts", params={"pair": "USD/MXN", "kind": "above", "value": 18, "webhook": secret})
+    assert r.status_code == 201
+    rule_id = r.json()["id"]
+    assert len(rule_id) >= 16 and not rule_id.isdigit()
+    assert "secret-token" not in r.text
+    assert "secret-token" not in client.get("/api/alerts").text
+    assert client.delete("/api/alerts/1").status_code == 404
+
+    reg.evaluate({"MXN": 17.0})
+    fired = reg.evaluate({"MXN": 18.5})
+    assert fired[0]["webhook"] == "https://8.8.8.8/***"
+    assert reg.webhook(rule_id) == secret  # la URL real sólo la usa WebhookSink
@@ -0,0 +1,97 @@
+import gzip
+import re
+
+from fastapi.testclient import TestClient
+
+import app.assets as assets
+import app.main as main
+
+client = TestClient(main.app)
+
+
+def _asset_url(name):
+    url = main.assets.url(name)
+    assert re.fullmatch(rf"/assets/{name.split('.')[0]}\.[0-9a-f]{{12}}\.{name.split('.')[1]}", url)
+    return url
+
+
+def test_template_references_fingerprinted_assets():
+    html = main.templates.get_template("index.html").render(
+        {"title": "t", "base": "USD", "date": None, "rows": [], "dropdown": [], "error": None}
+    )
+    assert _asset_url("app.js") in html
+    assert _asset_url("styles.css") in html
+    assert "/static/" not in html
+
+
+def test_asset_served_immutable_with_gzip():
+    url = _asset_url("styles.css")
+    raw = (main.STATIC_DIR / "styles.css").read_bytes()
+
+    r = client.get(url, headers={"accept-encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert "immutable" in r.headers["cache-control"]
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.content == raw  # httpx descomprime
+
+
+def test_asset_identity_and_not_modified():
+    url = _asset_url("app.js")
+
+    r = client.get(url, headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.content == (main.STATIC_DIR / "app.js").read_bytes()
+
+    r304 = client.get(url, headers={"accept-encoding": "identity", "if-none-match": r.headers["etag"]})
+    assert r304.status_code == 304
+
+
+def test_unknown_or_stale_hash_returns_404():
+    assert client.get("/assets/app.000000000000.js").status_code == 404
+
+
+def test_negotiate_picks_highest_q_and_breaks_ties_with_brotli():
+    asset = assets.Asset("a.js", "a.x.js", "text/javascript", b"body", '"x"', {"gzip": gzip.compress(b"body"), "br": b"BR"})
+    assert assets.negotiate(asset, "gzip, br")[0] == "br"
+    assert assets.negotiate(asset, "gzip, br;q=0")[0] == "gzip"
+    assert assets.negotiate(asset, "gzip;q=1, br;q=0.1")[0] == "gzip"
+    assert assets.negotiate(asset, "br;q=0.5, gzip;q=0.5")[0] == "br"
+    assert assets.negotiate(asset, "*;q=0.3")[0] == "br"
+    assert assets.negotiate(asset, "gzip;q=0.2, identity;q=0.9") == (None, b"body")
+    assert assets.negotiate(asset, "") == (None, b"body")
+
+
+def test_etag_differs_per_encoding_and_if_none_match_list():
+    url = _asset_url("styles.css")
+    identity = client.get(url, headers={"accept-encoding": "identity"}).headers["etag"]
+    gz = client.get(url, headers={"accept-encoding": "gzip"}).headers["etag"]
+    assert identity != gz
+    assert gz.endswith('-gzip"')
+
+    # la etag de otra representación no valida la que se negociaría
+    r = client.get(url, headers={"accept-encoding": "gzip", "if-none-match": identity})
+    assert r.status_code == 200
+
+    r = client.get(url, headers={"accept-encoding": "gzip", "if-none-match": f'"zzz", W/{gz}'})
+    assert r.status_code == 304
+    assert r.headers["etag"] == gz
+
+    r = client.get(url, headers={"if-none-match": "*"})
+    assert r.status_code == 304
+
+
+def test_etag_matches():
+    assert assets.etag_matches('"a", "b"', '"b"')
+    assert assets.etag_matches('W/"b"', '"b"')
+    assert assets.etag_matches("*", '"b"')
+    assert not assets.etag_matches('"a"', '"b"')
+    assert not assets.etag_matches("", '"b"')
+
+
+def test_asset_head_supported():
+    url = _asset_url("styles.css")
+    r = client.head(url, headers={"accept-encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"] == client.get(url, headers={"accept-encoding": "gzip"}).headers["etag"]
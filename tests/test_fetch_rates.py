@@ -1,4 +1,7 @@
 import asyncio
+
+import httpx
+
 import app.main as main
 
 
@@ -46,7 +49,7 @@ def test_fetch_rates_first_call_not_cached(monkeypatch):
     monkeypatch.setattr(main, "_get_supported_currencies", fake_supported)
 
     payload = {"base": "USD", "date": "2026-01-19", "rates": {"EUR": 0.9, "JPY": 160.0}}
-    monkeypatch.setattr(main.httpx, "AsyncClient", lambda timeout=10.0: _DummyAsyncClient(payload))
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: _DummyAsyncClient(payload))
 
     out = asyncio.run(main.fetch_rates())
     assert out["base"] == "USD"
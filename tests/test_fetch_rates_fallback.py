@@ -1,5 +1,7 @@
 import asyncio
 
+import httpx
+
 import app.main as main
 
 
@@ -75,7 +77,7 @@ def test_fetch_rates_fallback_when_symbols_call_fails(monkeypatch):
     )
 
     dummy = _DummyAsyncClientFallback()
-    monkeypatch.setattr(main.httpx, "AsyncClient", lambda timeout=10.0: dummy)
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: dummy)
 
     out = asyncio.run(main.fetch_rates())
     assert out["base"] == "USD"
@@ -86,7 +88,7 @@ def test_fetch_rates_fallback_when_symbols_call_fails(monkeypatch):
 
 def test_get_supported_currencies_and_fetch_rates_handle_invalid_payload(monkeypatch):
     dummy = _DummyAsyncClientInvalidPayload()
-    monkeypatch.setattr(main.httpx, "AsyncClient", lambda timeout=10.0: dummy)
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: dummy)
 
     supported = asyncio.run(main._get_supported_currencies())
     assert supported == {}  # porque payload no era dict
@@ -0,0 +1,163 @@
+import random
+import time
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+import app.money as money
+
+client = TestClient(main.app)
+
+RATES = {"EUR": 0.8, "JPY": 160.0, "GBP": 0.7891, "MXN": 17.1234, "KWD": 0.3071}
+
+
+def test_convert_rounds_to_minor_units():
+    engine = money.ConversionEngine("USD", RATES)
+    assert engine.convert(Decimal("8"), "EUR", "JPY") == Decimal("1600")
+    assert engine.convert(Decimal("1.234"), "USD", "JPY") == Decimal("197")  # JPY: 0 decimales
+    assert engine.convert(Decimal("10"), "USD", "KWD") == Decimal("3.071")  # KWD: 3 decimales
+    assert str(engine.convert(Decimal("10"), "USD", "EUR")) == "8.00"
+    assert engine.convert(Decimal("5"), "USD", "USD") == Decimal("5.00")
+    assert engine.convert(Decimal("1"), "USD", "CHF") is None
+
+
+def test_rounding_modes():
+    engine = money.ConversionEngine("USD", {"EUR": 0.5})
+    # 0.25 USD -> 0.125 EUR
+    assert engine.convert(Decimal("0.25"), "USD", "EUR", "half_even") == Decimal("0.12")
+    assert engine.convert(Decimal("0.25"), "USD", "EUR", "half_up") == Decimal("0.13")
+    assert engine.convert(Decimal("0.25"), "USD", "EUR", "down") == Decimal("0.12")
+    assert engine.convert(Decimal("0.25"), "USD", "EUR", "ceiling") == Decimal("0.13")
+    with pytest.raises(KeyError):
+        engine.convert(Decimal("1"), "USD", "EUR", "sideways")
+
+
+def test_to_decimal_keeps_published_value():
+    assert money.to_decimal(0.9) == Decimal("0.9")
+    assert money.to_decimal("10.05") == Decimal("10.05")
+    assert money.to_decimal("abc") is None
+    assert money.to_decimal(float("nan")) is None
+    assert money.to_decimal(True) is None  # Decimal(True) == 1
+
+
+def _patch_rates(monkeypatch):
+    snapshot = {"date": "2026-01-19", "rates": dict(RATES)}
+
+    async def fake_fetch_rates():
+        return snapshot
+
+    async def fake_supported():
+        return {"USD": "US Dollar", "EUR": "Euro", "JPY": "Yen", "MXN": "Peso", "KWD": "Dinar"}
+
+    monkeypatch.setattr(main, "fetch_rates", fake_fetch_rates)
+    monkeypatch.setattr(main, "_get_supported_currencies", fake_supported)
+
+
+def test_api_convert_exact_result_and_engine_cached(monkeypatch):
+    _patch_rates(monkeypatch)
+
+    r = client.get("/api/convert?amount=1.234&from=USD&to=JPY&rounding=half_up")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["result"] == 197.44
+    assert body["result_exact"] == "197"
+    assert body["rounding"] == "half_up"
+
+    engine = main._cache["engine"][1]
+    client.get("/api/convert?amount=2&from=EUR&to=MXN")
+    assert main._cache["engine"][1] is engine  # mismo snapshot => mismo engine
+
+    assert client.get("/api/convert?amount=1&from=USD&to=EUR&rounding=bogus").status_code == 422
+
+
+def test_api_convert_batch(monkeypatch):
+    _patch_rates(monkeypatch)
+
+    items = [
+        {"amount": "8", "from": "eur", "to": "JPY"},
+        {"amount": 10, "from": "USD", "to": "KWD"},
+        {"amount": "-1", "from": "USD", "to": "EUR"},
+        {"amount": "1", "from": "USD", "to": "GBP"},  # no soportada
+        {"amount": True, "from": "USD", "to": "EUR"},
+    ]
+    r = client.post("/api/convert/batch?rounding=half_even", json={"items": items})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[0]["result"] == "1600"
+    assert results[1]["result"] == "3.071"
+    assert results[2]["error"] == "Invalid amount"
+    assert "Unsupported" in results[3]["error"]
+    assert results[4]["error"] == "Invalid amount"
+
+    too_many = [{"amount": "1", "from": "USD", "to": "EUR"}] * (main._BATCH_MAX_ITEMS + 1)
+    assert client.post("/api/convert/batch", json={"items": too_many}).status_code == 400
+
+
+def test_amount_out_of_range_is_reported_not_raised():
+    engine = money.ConversionEngine("USD", RATES)
+    with pytest.raises(money.AmountOutOfRange):
+        engine.convert(Decimal("1e27"), "USD", "EUR")
+    out = engine.convert_many([(Decimal("1e40"), "USD", "EUR"), (Decimal("1"), "USD", "EUR"), (Decimal("1"), "USD", "CHF")])
+    assert out[0][0] is None and "out of range" in out[0][1]
+    assert out[1] == (Decimal("0.80"), None)
+    assert out[2] == (None, money.RATE_NOT_AVAILABLE)
+
+
+def test_api_convert_large_amount_is_400_not_500(monkeypatch):
+    _patch_rates(monkeypatch)
+
+    for amount in ("1e27", "123456789012345678901234567"):
+        r = client.get(f"/api/convert?amount={amount}&from=USD&to=MXN")
+        assert r.status_code == 400
+        assert "out of range" in r.json()["error"]
+
+    items = [{"amount": "1e40", "from": "USD", "to": "EUR"}, {"amount": "1", "from": "USD", "to": "EUR"}]
+    r = client.post("/api/convert/batch", json={"items": items})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert "out of range" in results[0]["error"]
+    assert results[1]["result"] == "0.80"
+
+
+def test_api_convert_exact_uses_query_decimal_not_float(monkeypatch):
+    _patch_rates(monkeypatch)
+    snapshot = {"date": "2026-01-19", "rates": {"JPY": 0.25}}
+
+    async def fake_fetch_rates():
+        return snapshot
+
+    monkeypatch.setattr(main, "fetch_rates", fake_fetch_rates)
+
+    # 2.0000000000000000001 * 0.25 = 0.5000...00025 -> 1 JPY; vía float (2.0) sería 0.5 -> 0 (half_even)
+    r = client.get("/api/convert?amount=2.0000000000000000001&from=USD&to=JPY&rounding=half_even")
+    assert r.status_code == 200
+    assert r.json()["result_exact"] == "1"
+
+
+@pytest.mark.benchmark
+def test_decimal_engine_throughput_within_factor_of_float_path():
+    # Benchmark de los paths de los endpoints, parseo del monto incluido: /api/convert
+    # (Decimal(s) + convert) y /api/convert/batch (to_decimal + convert_many) contra float(s)
+    # + _compute_cross. Opt-in: pytest -m benchmark (ver conftest.py).
+    max_factor = 6.0
+    ccys = ["USD", *RATES]
+    rnd = random.Random(1)
+    raw = [(f"{rnd.uniform(1, 10_000):.2f}", rnd.choice(ccys), rnd.choice(ccys)) for _ in range(20_000)]
+    engine = money.ConversionEngine("USD", RATES)
+
+    def best_of(fn, runs=3):
+        best = float("inf")
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    t_float = best_of(lambda: [main._compute_cross(float(a), f, t, RATES) for a, f, t in raw])
+    t_decimal = best_of(lambda: [engine.convert(Decimal(a), f, t) for a, f, t in raw])
+    t_batch = best_of(lambda: engine.convert_many([(money.to_decimal(a), f, t) for a, f, t in raw]))
+
+    assert t_decimal / t_float < max_factor
+    assert t_batch / t_float < max_factor
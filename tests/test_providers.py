@@ -0,0 +1,111 @@
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+import app.providers as providers
+
+
+FIXTURE = {
+    "currencies": {"USD": "US Dollar", "EUR": "Euro", "JPY": "Yen"},
+    "latest": {"base": "USD", "date": "2026-01-19", "rates": {"EUR": 0.9, "JPY": 160.0, "GBP": 0.8}},
+    "timeseries": {
+        "rates": {
+            "2025-12-01": {"EUR": 0.95},
+            "2026-01-18": {"EUR": 0.91},
+            "2026-01-19": {"EUR": 0.9},
+        }
+    },
+}
+
+
+class _StaticProvider(providers.RatesProvider):
+    def __init__(self, name, latest=None, delay=0.0, error=None):
+        self.name = name
+        self._latest = latest
+        self._delay = delay
+        self._error = error
+
+    async def latest(self, base, symbols):
+        await asyncio.sleep(self._delay)
+        if self._error:
+            raise self._error
+        return self._latest
+
+    async def currencies(self):
+        return {}
+
+    async def timeseries(self, base, symbol, start, end):
+        return []
+
+
+def _write_fixture(tmp_path):
+    path = tmp_path / "fx.json"
+    path.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    return path
+
+
+def test_fixture_provider_replays_recorded_data(tmp_path):
+    p = providers.FixtureProvider(_write_fixture(tmp_path))
+
+    assert asyncio.run(p.currencies())["EUR"] == "Euro"
+
+    latest = asyncio.run(p.latest("USD", ["EUR", "JPY"]))
+    assert latest["date"] == "2026-01-19"
+    assert latest["rates"] == {"EUR": 0.9, "JPY": 160.0}
+
+    # ventana de 7 días anclada a la última fecha grabada
+    points = asyncio.run(p.timeseries("USD", "EUR", date(2030, 1, 1), date(2030, 1, 8)))
+    assert points == [("2026-01-18", 0.91), ("2026-01-19", 0.9)]
+
+
+def test_fanout_returns_first_valid_answer():
+    slow = _StaticProvider("slow", {"base": "USD", "date": "slow", "rates": {"EUR": 1.0}}, delay=0.2)
+    broken = _StaticProvider("broken", error=RuntimeError("down"))
+    empty = _StaticProvider("empty", {"base": "USD", "date": None, "rates": {}})
+    fast = _StaticProvider("fast", {"base": "USD", "date": "fast", "rates": {"EUR": 0.9}}, delay=0.01)
+
+    fan = providers.FanOutProvider([slow, broken, empty, fast])
+    out = asyncio.run(fan.latest("USD", ["EUR"]))
+    assert out["date"] == "fast"
+    assert fan.name == "fanout(slow,broken,empty,fast)"
+    assert fan.source("latest") == "fast/latest via fanout(slow,broken,empty,fast)"
+
+
+def test_provider_missing_a_method_fails_at_construction():
+    class Incomplete(providers.RatesProvider):
+        async def latest(self, base, symbols):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_latest_keeps_amount_field(tmp_path):
+    p = providers.FixtureProvider(_write_fixture(tmp_path))
+    assert asyncio.run(p.latest("USD", ["EUR"]))["amount"] == 1.0
+    assert providers._normalize_latest({"amount": 10.0, "rates": {}}, "USD", [])["amount"] == 10.0
+
+
+def test_fanout_raises_when_all_providers_fail():
+    fan = providers.FanOutProvider([
+        _StaticProvider("a", error=RuntimeError("a down")),
+        _StaticProvider("b", error=RuntimeError("b down")),
+    ])
+    with pytest.raises(RuntimeError):
+        asyncio.run(fan.latest("USD", ["EUR"]))
+
+
+def test_build_provider_from_spec(tmp_path):
+    assert isinstance(providers.build_provider("frankfurter"), providers.FrankfurterProvider)
+
+    fan = providers.build_provider("frankfurter,frankfurter:https://fx.example.com/v1")
+    assert isinstance(fan, providers.FanOutProvider)
+    assert fan.name == "fanout(frankfurter.dev/v1,fx.example.com/v1)"
+    assert fan.providers[1].base_url == "https://fx.example.com/v1"
+
+    with pytest.raises(ValueError):
+        providers.build_provider("fixture", "")
+    with pytest.raises(ValueError):
+        providers.build_provider("nope")
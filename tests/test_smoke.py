@@ -1,3 +1,4 @@
+import httpx
 from fastapi.testclient import TestClient
 
 import app.main as main
@@ -45,7 +46,7 @@ def test_health_ok():
 
 def test_rates_ok_offline_and_cached(monkeypatch):
     dummy = _DummyAsyncClient()
-    monkeypatch.setattr(main.httpx, "AsyncClient", lambda timeout=10.0: dummy)
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: dummy)
 
     r1 = client.get("/api/rates")
     assert r1.status_code == 200
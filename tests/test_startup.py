@@ -0,0 +1,59 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import app.assets as assets
+import app.main as main
+import app.startup as startup
+
+client = TestClient(main.app)
+
+
+def test_debug_startup_reports_import_phases():
+    r = client.get("/api/debug/startup")
+    assert r.status_code == 200
+    phases = r.json()["phases_ms"]
+    assert phases["import"] >= 0
+    assert phases["app_construction"] >= 0
+
+
+def test_profile_records_first_value_only():
+    p = startup.StartupProfile()
+    p.record("x", 0.010)
+    p.record("x", 5.0)
+    assert p.report()["phases_ms"]["x"] == 10.0
+    with p.phase("y"):
+        pass
+    assert p.done("y")
+
+
+def test_asset_manifest_builds_lazily():
+    seen = []
+    manifest = assets.AssetManifest(main.STATIC_DIR, on_build=seen.append)
+    assert seen == []
+    assert manifest.url("app.js").startswith("/assets/app.")
+    manifest.url("styles.css")
+    assert len(seen) == 1
+
+
+def test_warmup_compiles_template_and_prefetches_rates(monkeypatch):
+    profile = startup.StartupProfile()
+    calls = []
+
+    async def fake_fetch_rates():
+        calls.append(1)
+        return {"rates": {}}
+
+    monkeypatch.setattr(main, "startup_profile", profile)
+    monkeypatch.setattr(main, "fetch_rates", fake_fetch_rates)
+    monkeypatch.setattr(main, "_template_compiled", False)
+
+    asyncio.run(main._warmup())
+    assert calls == [1]
+    assert profile.done("template_compile")
+    assert main._template_compiled
+
+    # El flag (no el profiler) decide si compilar: un profile nuevo no vuelve a compilar
+    monkeypatch.setattr(main, "startup_profile", startup.StartupProfile())
+    main._ensure_template_compiled()
+    assert not main.startup_profile.done("template_compile")
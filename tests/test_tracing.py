@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.main as main
+import app.tracing as tracing
+
+client = TestClient(main.app)
+
+
+def _phases(header):
+    return {p.split(";")[0].strip() for p in header.split(",")}
+
+
+def test_rates_response_has_server_timing(monkeypatch):
+    async def fake_supported():
+        return {"USD": "US Dollar", "EUR": "Euro"}
+
+    async def fake_latest(base, symbols):
+        return {"base": base, "date": "2026-01-19", "rates": {"EUR": 0.9}}
+
+    monkeypatch.setattr(main, "_get_supported_currencies", fake_supported)
+    monkeypatch.setattr(main.provider, "latest", fake_latest)
+
+    r = client.get("/api/rates")
+    assert r.status_code == 200
+    assert _phases(r.headers["server-timing"]) == {"cache", "upstream", "serialize", "total"}
+
+    r2 = client.get("/api/rates")
+    assert _phases(r2.headers["server-timing"]) == {"cache", "serialize", "total"}
+
+
+def test_file_exporter_writes_otlp_and_honours_traceparent(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    mini = FastAPI()
+
+    @mini.get("/x")
+    async def x():
+        with tracing.span("upstream.fake", "upstream", provider="fake"):
+            await asyncio.sleep(0)
+        return {"ok": True}
+
+    exporter = tracing.FileSpanExporter(path)
+    mini.add_middleware(tracing.TracingMiddleware, exporter=exporter)
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    r = TestClient(mini).get("/x", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+    assert "upstream;dur=" in r.headers["server-timing"]
+    asyncio.run(exporter.shutdown())  # la escritura ocurre en el thread del exporter
+
+    doc = json.loads(path.read_text().splitlines()[0])
+    spans = doc["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, child = spans
+    assert root["traceId"] == child["traceId"] == trace_id
+    assert root["parentSpanId"] == "00f067aa0ba902b7"
+    assert root["kind"] == 2 and child["kind"] == 3
+    assert child["parentSpanId"] == root["spanId"]
+    assert {"key": "provider", "value": {"stringValue": "fake"}} in child["attributes"]
+
+
+def test_span_outside_request_is_noop():
+    with tracing.span("cache.x", "cache") as s:
+        assert s is None
+    assert tracing.current_trace() is None
+
+
+def _trace(name="GET /x"):
+    root = tracing.Span(name, "a" * 32, "b" * 16, None, start_ns=1, end_ns=2)
+    return tracing.Trace(root.trace_id, root)
+
+
+def test_otlp_http_exporter_flushes_on_timer_and_shutdown(monkeypatch):
+    posted = []
+
+    async def fake_post(self, batch):
+        posted.append(len(batch))
+
+    monkeypatch.setattr(tracing.OTLPHttpSpanExporter, "_post", fake_post)
+
+    async def run():
+        exporter = tracing.OTLPHttpSpanExporter("http://collector:4318", batch_size=100, flush_seconds=0.01)
+        exporter.export(_trace())
+        exporter.export(_trace())
+        await asyncio.sleep(0.05)  # instancia ociosa: el timer igual vacía el buffer
+        assert posted == [2]
+
+        exporter.export(_trace())
+        await exporter.shutdown()
+        assert posted == [2, 1]
+        assert exporter._timer is None
+
+    asyncio.run(run())
+
+
+def test_file_exporter_batches_and_close_is_idempotent(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = tracing.FileSpanExporter(path)
+    for _ in range(5):
+        exporter.export(_trace())
+    exporter.close()
+    exporter.close()
+    assert len(path.read_text().splitlines()) == 5
+
+
+def test_exporter_without_export_fails_at_construction():
+    class Incomplete(tracing.SpanExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -1,6 +1,12 @@
 import asyncio
 
+import httpx
+from fastapi.testclient import TestClient
+
 import app.main as main
+import app.trend as trend
+
+client = TestClient(main.app)
 
 
 class _DummyResp:
@@ -40,7 +46,7 @@ def test_fetch_trend_clamps_days_and_caches(monkeypatch):
         }
     }
     dummy = _DummyAsyncClientTrend(payload)
-    monkeypatch.setattr(main.httpx, "AsyncClient", lambda timeout=10.0: dummy)
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: dummy)
 
     out1 = asyncio.run(main._fetch_trend("USD", "EUR", 1))  # clamp => 7
     assert out1["base"] == "USD"
@@ -55,3 +61,65 @@ def test_fetch_trend_clamps_days_and_caches(monkeypatch):
 
     out3 = asyncio.run(main._fetch_trend("USD", "EUR", 999))  # clamp => 180
     assert out3["days"] == 180
+
+
+def _series(n):
+    from datetime import date, timedelta
+
+    d0 = date(2025, 7, 1)
+    return {(d0 + timedelta(days=i)).isoformat(): {"MXN": 17.0 + (i % 10) * 0.1} for i in range(n)}
+
+
+def test_lttb_keeps_endpoints_and_size():
+    points = [(d, v["MXN"]) for d, v in sorted(_series(180).items())]
+    out = trend.lttb(points, 20)
+    assert len(out) == 20
+    assert out[0] == points[0]
+    assert out[-1] == points[-1]
+    assert trend.lttb(points[:5], 20) == points[:5]
+
+
+def test_encode_decode_roundtrip():
+    points = [("2026-01-18", 17.123456789), ("2026-01-19", 17.2), ("2026-03-01", 18.0)]
+    assert trend.decode_points(trend.encode_points(points)) == points
+    assert trend.decode_points(trend.encode_points([])) == []
+
+
+def test_api_trend_max_points_and_binary(monkeypatch):
+    dummy = _DummyAsyncClientTrend({"rates": _series(120)})
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: dummy)
+
+    r = client.get("/api/trend?symbol=MXN&days=180&max_points=50")
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["points"]) == 50
+    assert body["_meta"]["total_points"] == 120
+
+    r = client.get("/api/trend?symbol=MXN&days=180&max_points=50&format=bin")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == trend.TREND_BIN_MEDIA_TYPE
+    assert r.headers["x-trend-symbol"] == "MXN"
+    decoded = trend.decode_points(r.content)
+    assert [{"date": d, "rate": v} for d, v in decoded] == body["points"]
+    assert dummy.calls == 1  # serie completa y downsampled salen de cache
+
+
+def test_trend_max_points_snapped_down_to_buckets_and_not_cached_when_no_reduction(monkeypatch):
+    dummy = _DummyAsyncClientTrend({"rates": _series(120)})
+    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout=10.0: dummy)
+
+    out = asyncio.run(main._fetch_trend("USD", "MXN", 180, 99))  # 99 -> bucket 50 (nunca más de lo pedido)
+    assert len(out["points"]) == 50
+    assert out["_meta"]["max_points"] == 50
+    asyncio.run(main._fetch_trend("USD", "MXN", 180, 61))  # mismo bucket => misma entrada
+
+    full = asyncio.run(main._fetch_trend("USD", "MXN", 180, 1500))  # bucket 800 >= 120 puntos
+    assert len(full["points"]) == 120
+    assert "max_points" not in full["_meta"]
+
+    keys = set(main._cache["trend"])
+    assert keys == {("USD", "MXN", 180, None), ("USD", "MXN", 180, 50)}
+    assert dummy.calls == 1
+
+    # Por debajo del bucket más chico no hay forma de respetar el máximo
+    assert client.get("/api/trend?symbol=MXN&days=180&max_points=3").status_code == 422